@@ -4,33 +4,52 @@ Single-file autonomous agent using Ollama (Llama 3.1) and Tavily web search.
 The agent autonomously decides when to use the web search tool.
 """
 
+import functools
+import hashlib
+import json
 import os
 import re
 import sys
+import threading
+from collections import OrderedDict
 from typing import Optional
 
 from dotenv import load_dotenv
 from langchain_ollama import ChatOllama
-from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from tavily import TavilyClient
 
-# Load environment variables
-load_dotenv()
-
 # Configuration
-TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
 OLLAMA_MODEL = "llama3.1"
 MAX_TOOL_ITERATIONS = 3
+STREAM_FLUSH_CHUNKS = 8  # streamed tokens are written in batches of this many (or at a newline)
+
+# Precompiled pattern for "TOOL_CALL <tool>: <query>" lines
+_TOOL_CALL_RE = re.compile(r"TOOL_CALL\s+(\w+):\s*(.+)")
+
+# Exact-match LLM response cache (LRU), keyed on model + messages
+RESPONSE_CACHE_SIZE = 512
+_response_cache: "OrderedDict[str, str]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
 
-# Initialize Ollama LLM
-llm = ChatOllama(model=OLLAMA_MODEL)
+# Clients are created lazily on first use, so importing this module stays cheap
+@functools.lru_cache(maxsize=1)
+def get_llm() -> ChatOllama:
+    """Return the shared Ollama LLM (created on first call)."""
+    load_dotenv()
+    return ChatOllama(model=OLLAMA_MODEL)
 
-# Initialize Tavily client
-tavily_client: Optional[TavilyClient] = None
-if TAVILY_API_KEY:
-    tavily_client = TavilyClient(api_key=TAVILY_API_KEY)
-else:
-    print("Warning: TAVILY_API_KEY not set. Web search will not work.", file=sys.stderr)
+
+@functools.lru_cache(maxsize=1)
+def get_tavily() -> Optional[TavilyClient]:
+    """Return the shared Tavily client, or None if TAVILY_API_KEY is not set."""
+    load_dotenv()
+    api_key = os.getenv("TAVILY_API_KEY")
+    if not api_key:
+        print("Warning: TAVILY_API_KEY not set. Web search will not work.", file=sys.stderr)
+        return None
+    return TavilyClient(api_key=api_key)
 
 
 def web_search(query: str) -> str:
@@ -43,6 +62,7 @@ def web_search(query: str) -> str:
     Returns:
         A formatted string containing search results (titles and snippets)
     """
+    tavily_client = get_tavily()
     if not tavily_client:
         return "Error: Tavily API key not configured. Cannot perform web search."
     
@@ -54,51 +74,100 @@ def web_search(query: str) -> str:
         )
         
         results = response.get("results", [])
-        if not results:
-            return "No search results found."
-        
-        summary_parts: list[str] = []
-        for result in results:
-            title = result.get("title", "No title")
-            content = result.get("content", "No content")
-            url = result.get("url", "")
-            
-            summary_parts.append(f"Title: {title}\nContent: {content}\nURL: {url}\n")
-        
-        return "\n".join(summary_parts)
+        return "\n\n".join(
+            f"Title: {r.get('title', 'No title')}\nContent: {r.get('content', 'No content')}\nURL: {r.get('url', '')}"
+            for r in results
+        ) or "No search results found."
     except Exception as e:
         return f"Error performing web search: {str(e)}"
 
 
-def call_llm(messages: list[dict[str, str]], system_prompt: str) -> str:
+def _response_cache_key(langchain_messages: list[BaseMessage]) -> str:
+    """Hash (model, messages) into a stable cache key."""
+    payload = json.dumps([OLLAMA_MODEL, [(m.type, m.content) for m in langchain_messages]])
+    return hashlib.blake2b(payload.encode("utf-8")).hexdigest()
+
+
+def _cache_get(key: str) -> Optional[str]:
+    """Return a cached LLM response (refreshing its LRU position), or None."""
+    with _response_cache_lock:
+        cached = _response_cache.get(key)
+        if cached is not None:
+            _response_cache.move_to_end(key)
+        return cached
+
+
+def _cache_put(key: str, content: str) -> None:
+    """Store an LLM response, evicting the least recently used entry if full."""
+    with _response_cache_lock:
+        _response_cache[key] = content
+        _response_cache.move_to_end(key)
+        if len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+
+class _StreamWriter:
+    """Writes streamed tokens to stdout in batches of STREAM_FLUSH_CHUNKS (or at a newline)."""
+    
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.pending: list[str] = []  # streamed but not yet written to stdout
+    
+    def write(self, text: str) -> None:
+        if self.enabled:
+            self.pending.append(text)
+            if len(self.pending) >= STREAM_FLUSH_CHUNKS or "\n" in text:
+                self.flush()
+    
+    def flush(self) -> None:
+        if self.pending:
+            sys.stdout.write("".join(self.pending))
+            sys.stdout.flush()
+            self.pending.clear()
+
+
+def call_llm(langchain_messages: list[BaseMessage], stream: bool = False) -> str:
     """
-    Call Ollama LLM with the given messages and system prompt.
+    Call Ollama LLM with the given conversation.
+    Identical (model, messages) requests are answered from an in-memory LRU
+    cache instead of re-invoking Ollama.
     
     Args:
-        messages: List of message dicts with 'role' and 'content' keys
-        system_prompt: System prompt string
+        langchain_messages: Conversation as LangChain messages (system prompt first),
+            maintained by the caller and appended to turn by turn
+        stream: If True, write tokens to stdout as they arrive
         
     Returns:
         The LLM's response text
     """
+    key = _response_cache_key(langchain_messages)
+    cached = _cache_get(key)
+    if cached is not None:
+        if stream:
+            sys.stdout.write(cached)
+            sys.stdout.flush()
+        return cached
+    
+    writer = _StreamWriter(stream)
     try:
-        # Convert messages to LangChain message format
-        langchain_messages = [SystemMessage(content=system_prompt)]
-        
-        for msg in messages:
-            role = msg.get("role", "user")
-            content = msg.get("content", "")
-            if role == "user":
-                langchain_messages.append(HumanMessage(content=content))
-            elif role == "assistant":
-                langchain_messages.append(AIMessage(content=content))
-        
-        # Call LLM
-        response = llm.invoke(langchain_messages)
-        
-        return response.content
+        if stream:
+            chunks: list[str] = []
+            for chunk in get_llm().stream(langchain_messages):
+                chunks.append(chunk.content)
+                writer.write(chunk.content)
+            content = "".join(chunks)
+        else:
+            content = get_llm().invoke(langchain_messages).content
     except Exception as e:
-        return f"Error calling LLM: {str(e)}"
+        error_msg = f"Error calling LLM: {str(e)}"
+        writer.write(error_msg)
+        writer.flush()
+        return error_msg
+    writer.flush()
+    
+    # Only successful responses are cached
+    _cache_put(key, content)
+    return content
 
 
 def parse_tool_call(response: str) -> Optional[tuple[str, str]]:
@@ -113,8 +182,7 @@ def parse_tool_call(response: str) -> Optional[tuple[str, str]]:
     Returns:
         A tuple of (tool_name, query) if found, None otherwise
     """
-    pattern = r"TOOL_CALL\s+(\w+):\s*(.+)"
-    match = re.search(pattern, response)
+    match = _TOOL_CALL_RE.search(response)
     if match:
         tool_name = match.group(1)
         query = match.group(2).strip()
@@ -149,8 +217,9 @@ def parse_tool_call(response: str) -> Optional[tuple[str, str]]:
 # 
 # Be concise and helpful in your responses."""
 # 
-#     conversation_history: list[dict[str, str]] = [
-#         {"role": "user", "content": user_question}
+#     lc_messages: list[BaseMessage] = [
+#         SystemMessage(content=system_prompt),
+#         HumanMessage(content=user_question),
 #     ]
 #     
 #     tool_used = False
@@ -161,10 +230,10 @@ def parse_tool_call(response: str) -> Optional[tuple[str, str]]:
 #         
 #         if debug:
 #             print(f"\n[Debug] Iteration {iterations}", file=sys.stderr)
-#             print(f"[Debug] Messages: {conversation_history}", file=sys.stderr)
+#             print(f"[Debug] Messages: {lc_messages}", file=sys.stderr)
 #         
 #         # Call LLM
-#         response = call_llm(conversation_history, system_prompt)
+#         response = call_llm(lc_messages)
 #         
 #         if debug:
 #             print(f"[Debug] LLM Response: {response}", file=sys.stderr)
@@ -187,14 +256,10 @@ def parse_tool_call(response: str) -> Optional[tuple[str, str]]:
 #                     print(f"[Debug] Tool result: {tool_result[:200]}...", file=sys.stderr)
 #                 
 #                 # Add assistant's tool request and tool result to conversation
-#                 conversation_history.append({
-#                     "role": "assistant",
-#                     "content": f"I need to search for: {query}"
-#                 })
-#                 conversation_history.append({
-#                     "role": "user",
-#                     "content": f"Tool result (web_search for '{query}'):\n{tool_result}\n\nNow answer the original question using this information."
-#                 })
+#                 lc_messages.append(AIMessage(content=f"I need to search for: {query}"))
+#                 lc_messages.append(HumanMessage(
+#                     content=f"Tool result (web_search for '{query}'):\n{tool_result}\n\nNow answer the original question using this information."
+#                 ))
 #             else:
 #                 # Unknown tool, treat as regular response
 #                 break
@@ -208,7 +273,12 @@ def parse_tool_call(response: str) -> Optional[tuple[str, str]]:
 #     return response
 
 
-def run_agent_no_tools(user_question: str, debug: bool = False) -> str:
+NO_TOOLS_SYSTEM_PROMPT = """You are a helpful AI assistant. Answer from your training knowledge only; you have no web search or external tools.
+If you don't know the answer or need current information, say so.
+Be concise: ≤150 words total."""
+
+
+def run_agent_no_tools(user_question: str, debug: bool = False, stream: bool = False) -> str:
     """
     Run the autonomous agent loop to answer a user question WITHOUT tool access.
     This agent can only use its training knowledge and cannot access web search.
@@ -216,26 +286,21 @@ def run_agent_no_tools(user_question: str, debug: bool = False) -> str:
     Args:
         user_question: The user's question
         debug: If True, print debug information
+        stream: If True, print tokens as they arrive
         
     Returns:
         The final answer from the agent
     """
-    system_prompt = """You are a helpful AI assistant. Answer questions based on your training knowledge.
-    
-You do not have access to web search or any external tools. You can only answer based on the information you were trained on.
-If you don't know the answer or need current information, be honest about your limitations.
-
-Be concise and helpful in your responses."""
-
-    conversation_history: list[dict[str, str]] = [
-        {"role": "user", "content": user_question}
+    lc_messages: list[BaseMessage] = [
+        SystemMessage(content=NO_TOOLS_SYSTEM_PROMPT),
+        HumanMessage(content=user_question),
     ]
     
     if debug:
-        print(f"[Debug] Messages: {conversation_history}", file=sys.stderr)
+        print(f"[Debug] Messages: {lc_messages}", file=sys.stderr)
     
     # Call LLM once (no tool iteration loop needed)
-    response = call_llm(conversation_history, system_prompt)
+    response = call_llm(lc_messages, stream=stream)
     
     if debug:
         print(f"[Debug] LLM Response: {response}", file=sys.stderr)
@@ -245,11 +310,13 @@ Be concise and helpful in your responses."""
 
 def main() -> None:
     """Main console REPL entry point."""
-    print("Autonomous Agent with Ollama (NO TOOLS)")
-    print("=" * 50)
-    print(f"Model: {OLLAMA_MODEL}")
-    print("Mode: Agent WITHOUT tool access (for comparison testing)")
-    print("Type your question (or 'exit' to quit):\n")
+    print(
+        "Autonomous Agent with Ollama (NO TOOLS)\n"
+        f"{'=' * 50}\n"
+        f"Model: {OLLAMA_MODEL}\n"
+        "Mode: Agent WITHOUT tool access (for comparison testing)\n"
+        "Type your question (or 'exit' to quit):\n"
+    )
     
     while True:
         try:
@@ -260,9 +327,9 @@ def main() -> None:
                 break
             
             print("\nAgent: ", end="", flush=True)
-            answer = run_agent_no_tools(user_input, debug=False)
-            print(answer)
-            print()  # Empty line for readability
+            # Tokens are printed as they stream in
+            run_agent_no_tools(user_input, debug=False, stream=True)
+            print("\n")  # Finish the answer line + empty line for readability
             
         except KeyboardInterrupt:
             print("\n\nGoodbye!")
@@ -1,12 +1,13 @@
 import utils
 
-from research_agent import find_references
+from research_agent import find_references_batch
 from utils import evaluate_tavily_results
 
 
-topic = "recent developments in black hole science"   # <- Change the topic here
+topics = ["recent developments in black hole science"]  # <- Change/add topics here (run concurrently)
 min_ratio = 0.4                                       # <- Change threshold (0.0–1.0)
 run_reflection = True                                 # <- Set False to skip Step 4
+use_domain_trie = False                               # <- Set True for large domain lists (subdomain-aware trie)
 
 # Short list of preferred domains (edit or expand as needed)
 TOP_DOMAINS = {
@@ -14,6 +15,9 @@ TOP_DOMAINS = {
     "nasa.gov", "mit.edu", "stanford.edu", "harvard.edu"
 }
 
+# Precompile the domain list into a reversed-label trie (O(len(host)) per URL)
+trusted_domains = utils.DomainTrie(TOP_DOMAINS) if use_domain_trie else TOP_DOMAINS
+
 # Show a sample of preferred domains
 import json
 utils.print_html(
@@ -21,11 +25,13 @@ utils.print_html(
     title="<h3>Sample Preferred Domains</h3>"
 )
 
-# 1) Research
-research_task = f"Find 2–3 key papers and reliable overviews about {topic}."
-research_output = find_references(research_task)
-utils.print_html(research_output, title=f"<h3>Research Results on {topic}</h3>")
+# 1) Research (all topics concurrently, bounded by OLLAMA_NUM_PARALLEL)
+research_tasks = [f"Find 2–3 key papers and reliable overviews about {topic}." for topic in topics]
+research_outputs = find_references_batch(research_tasks)
+
+for topic, research_output in zip(topics, research_outputs):
+    utils.print_html(research_output, title=f"<h3>Research Results on {topic}</h3>")
 
-# 2) Evaluate sources (preferred domains ratio)
-flag, eval_md = evaluate_tavily_results(TOP_DOMAINS, research_output, min_ratio=min_ratio)
-utils.print_html("<pre>" + eval_md + "</pre>", title="<h3>Evaluation Summary</h3>")
\ No newline at end of file
+    # 2) Evaluate sources (preferred domains ratio)
+    flag, eval_md = evaluate_tavily_results(trusted_domains, research_output, min_ratio=min_ratio)
+    utils.print_html("<pre>" + eval_md + "</pre>", title="<h3>Evaluation Summary</h3>")
@@ -5,17 +5,28 @@ Console-based testing script for the research agent.
 
 from research_agent import find_references
 
+HEAVY_RULE = "=" * 60
+LIGHT_RULE = "-" * 60
+
+
+def print_progress(message):
+    """Print agent tool activity as it happens."""
+    for call in getattr(message, "tool_calls", None) or []:
+        print(f"  -> {call['name']}({call['args']})", flush=True)
+    if getattr(message, "type", None) == "tool":
+        print(f"  <- {message.name} returned {len(message.content)} chars", flush=True)
+
 
 def main():
     """Main console interface for testing research tasks."""
-    print("=" * 60)
-    print("Research Agent - Console Testing")
-    print("=" * 60)
-    print("\nThis tool can search:")
-    print("  - arXiv for academic papers")
-    print("  - Tavily for general web search")
-    print("  - Wikipedia for encyclopedic summaries")
-    print("\n" + "-" * 60)
+    print(
+        f"{HEAVY_RULE}\nResearch Agent - Console Testing\n{HEAVY_RULE}\n"
+        "\nThis tool can search:\n"
+        "  - arXiv for academic papers\n"
+        "  - Tavily for general web search\n"
+        "  - Wikipedia for encyclopedic summaries\n"
+        f"\n{LIGHT_RULE}"
+    )
     
     while True:
         print("\nEnter a research task (or 'quit' to exit):")
@@ -29,18 +40,11 @@ def main():
             print("Please enter a valid task.")
             continue
         
-        print("\n" + "=" * 60)
-        print(f"Researching: {task}")
-        print("=" * 60)
-        print("\nProcessing... (this may take a moment)\n")
+        print(f"\n{HEAVY_RULE}\nResearching: {task}\n{HEAVY_RULE}\n\nProcessing... (this may take a moment)\n")
         
         try:
-            result = find_references(task)
-            print("\n" + "-" * 60)
-            print("RESULT:")
-            print("-" * 60)
-            print(result)
-            print("\n" + "=" * 60)
+            result = find_references(task, on_message=print_progress)
+            print(f"\n{LIGHT_RULE}\nRESULT:\n{LIGHT_RULE}\n{result}\n\n{HEAVY_RULE}")
         except KeyboardInterrupt:
             print("\n\nInterrupted by user.")
             break
@@ -8,6 +8,15 @@ from langchain_ollama import ChatOllama
 from langchain_core.tools import StructuredTool
 import inspect
 
+# Build the LLM and agent once; sections [3] and [4] both inspect the same agent
+agent = None
+agent_error = None
+try:
+    llm = ChatOllama(model="llama3.1", temperature=0.1)
+    agent = agents.create_agent(model=llm, tools=[], system_prompt="Test")
+except Exception as e:
+    agent_error = e
+
 print("=" * 80)
 print("VERIFICATION: How to set max_iterations in LangChain 1.2.9")
 print("=" * 80)
@@ -58,9 +67,8 @@ except Exception as e:
 print("\n[3] Checking what create_agent returns:")
 print("-" * 80)
 try:
-    llm = ChatOllama(model="llama3.1", temperature=0.1)
-    tools = []
-    agent = agents.create_agent(model=llm, tools=tools, system_prompt="Test")
+    if agent is None:
+        raise agent_error
     print(f"Agent type: {type(agent)}")
     print(f"Agent class: {agent.__class__.__name__}")
     print(f"Agent module: {agent.__class__.__module__}")
@@ -82,9 +90,8 @@ except Exception as e:
 print("\n[4] Checking for configurable fields:")
 print("-" * 80)
 try:
-    llm = ChatOllama(model="llama3.1", temperature=0.1)
-    tools = []
-    agent = agents.create_agent(model=llm, tools=tools, system_prompt="Test")
+    if agent is None:
+        raise agent_error
     
     # Check if agent has config_schema or similar
     if hasattr(agent, 'config_schema'):
@@ -3,98 +3,243 @@
 # =========================
 
 # --- Standard library 
+import asyncio
+import functools
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # --- Third-party ---
 from langchain_ollama import ChatOllama
 from langchain import agents
-from langchain_core.tools import StructuredTool
+from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
 
 # --- Local / project ---
-from tool_wrappers import arxiv_wrapper, tavily_wrapper, wikipedia_wrapper
+from tool_wrappers import TOOLS, arxiv_wrapper_async, tavily_wrapper_async, wikipedia_wrapper_async
+from semantic_cache import SemanticCache
 import utils
 
 
+# =========================
+# Semantic Cache
+# =========================
+SEMANTIC_CACHE_DIR = os.getenv("SEMANTIC_CACHE_DIR", ".semantic_cache")
+SEMANTIC_CACHE_TTL = 24 * 3600  # answers cite current web results, so they go stale like them
+
+_semantic_caches: dict[str, SemanticCache] = {}
+_semantic_caches_lock = threading.Lock()
+
+
+def get_semantic_cache(model: str) -> SemanticCache:
+    """Return the persistent semantic cache for a model (results are model-specific)."""
+    with _semantic_caches_lock:
+        cache = _semantic_caches.get(model)
+        if cache is None:
+            subdir = re.sub(r"[^\w.-]", "_", model)
+            cache = SemanticCache(path=os.path.join(SEMANTIC_CACHE_DIR, subdir), ttl=SEMANTIC_CACHE_TTL)
+            _semantic_caches[model] = cache
+        return cache
+
+
+# =========================
+# Concurrent Prefetch
+# =========================
+PREFETCH_CONCURRENCY = 3
+
+PREFETCH_TOOLS = (
+    ("arxiv_search_tool", arxiv_wrapper_async),
+    ("tavily_search_tool", tavily_wrapper_async),
+    ("wikipedia_search_tool", wikipedia_wrapper_async),
+)
+
+
+async def _prefetch_sources(task: str) -> list[tuple[str, str]]:
+    """Query all research tools for the task concurrently."""
+    semaphore = asyncio.Semaphore(PREFETCH_CONCURRENCY)
+    
+    async def run(name, wrapper):
+        async with semaphore:
+            return name, await wrapper(task)
+    
+    return await asyncio.gather(*(run(name, wrapper) for name, wrapper in PREFETCH_TOOLS))
+
+
+def _run_coroutine(coro):
+    """Run a coroutine to completion, even if this thread already has a running loop (e.g. Jupyter)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+# =========================
+# System Prompt
+# =========================
+# Static prefix, byte-identical across calls so Ollama can reuse its KV cache;
+# anything that varies (the date) is appended after it.
+SYSTEM_PROMPT_PREFIX = """You are a research assistant with three tools:
+- arxiv_search_tool: academic papers and scientific publications (pass only 'query').
+- tavily_search_tool: current news, recent developments, general web information.
+- wikipedia_search_tool: definitions, background and encyclopedic overviews.
+
+Use the appropriate tools, then answer the user's task and cite source URLs. Be concise: ≤150 words total."""
+
+
+@functools.lru_cache(maxsize=1)
+def _today(bucket: int) -> str:
+    """Today's date as YYYY-MM-DD, recomputed at most once per bucket (see _system_prompt)."""
+    return datetime.now().strftime('%Y-%m-%d')
+
+
+def _system_prompt() -> str:
+    """Static prefix followed by the current date (cached in 60-second buckets)."""
+    return f"{SYSTEM_PROMPT_PREFIX}\nToday is {_today(int(time.time()) // 60)}."
+
+
+# =========================
+# Early Exit
+# =========================
+# Stop the tool loop once tool observations contain this many distinct reference URLs,
+# coming from at least MIN_SOURCES different tools (one search alone returns up to 5 URLs)
+MIN_REFERENCES = 3
+MIN_SOURCES = 2
+
+_REFERENCE_URL_RE = re.compile(r"https?://[^\s\)\]\}<>\"']+")
+
+
+def _has_enough_evidence(messages) -> bool:
+    """True if the agent just received a tool observation and the observations so far cite
+    MIN_REFERENCES URLs from MIN_SOURCES different tools."""
+    if not messages or not isinstance(messages[-1], ToolMessage):
+        return False
+    urls = set()
+    sources = set()
+    for msg in messages:
+        if isinstance(msg, ToolMessage):
+            found = _REFERENCE_URL_RE.findall(str(msg.content))
+            if found:
+                urls.update(found)
+                sources.add(msg.name)
+    return len(urls) >= MIN_REFERENCES and len(sources) >= MIN_SOURCES
+
+
+def _had_tool_error(messages, observations=()) -> bool:
+    """True if any tool observation (agent or prefetched) was an error; such answers are not cached."""
+    texts = [str(msg.content) for msg in messages if isinstance(msg, ToolMessage)]
+    texts.extend(text for _, text in observations)
+    return any(text.startswith("Error") for text in texts)
+
+
+def _answer_from_evidence(llm, system_prompt: str, messages) -> str:
+    """Ask the model for the final answer from the tool observations gathered so far (no more tool calls)."""
+    response = llm.invoke([
+        SystemMessage(content=system_prompt),
+        *messages,
+        HumanMessage(content="You now have enough sources. Answer the original task using the tool results above."),
+    ])
+    return response.content
+
+
+# =========================
+# Shared LLM and Agent
+# =========================
+@functools.lru_cache(maxsize=4)
+def get_llm(model: str, temperature: float = 0.1) -> ChatOllama:
+    """Return a shared ChatOllama per (model, temperature) so its HTTP connection stays warm."""
+    return ChatOllama(model=model, temperature=temperature)
+
+
+@functools.lru_cache(maxsize=4)
+def _get_agent(model: str, system_prompt: str):
+    """Return a shared agent graph per (model, system prompt); the prompt only changes with the date."""
+    return agents.create_agent(
+        model=get_llm(model),
+        tools=TOOLS,
+        system_prompt=system_prompt
+    )
+
+
 # =========================
 # Find References
 # =========================
-def find_references(task: str, model: str = "llama3.1", return_messages: bool = False):
-    """Perform a research task using external tools (arxiv, tavily, wikipedia)."""
+def find_references(task: str, model: str = "llama3.1", return_messages: bool = False, use_cache: bool = True,
+                    prefetch: bool = False, on_message=None, early_exit: bool = True):
+    """
+    Perform a research task using external tools (arxiv, tavily, wikipedia).
+    Semantically equivalent tasks are answered from the semantic cache when
+    use_cache is True. With prefetch=True all three tools are queried
+    concurrently up front and their results handed to the agent, so broad
+    tasks usually need a single model turn instead of several tool round-trips.
+    If given, on_message is called with each new agent message (tool calls,
+    tool results) as the run progresses. With early_exit=True the tool loop
+    stops once the results cite enough references from several tools, and
+    the model answers from what it has.
+    """
     
     # Extract model name if it's in "ollama:llama3.1" format
     if model.startswith("ollama:"):
         model = model.replace("ollama:", "")
     
-    # Initialize LLM
-    llm = ChatOllama(model=model, temperature=0.1)
-    
-    # Create LangChain Tools using wrappers (which now track internally)
-    tools = [
-        StructuredTool.from_function(
-            arxiv_wrapper,
-            name="arxiv_search_tool",
-            description="Searches arXiv for academic research papers. Use this for finding scientific papers, academic articles, or research publications. IMPORTANT: Only pass 'query' parameter. Do NOT pass max_results - it automatically uses 5 (which is also the maximum). Parameters: query (required, string), max_results (DO NOT USE - auto-set to 5, maximum 5)."
-        ),
-        StructuredTool.from_function(
-            tavily_wrapper,
-            name="tavily_search_tool",
-            description="Performs a general-purpose web search using Tavily. Use this for finding current news, recent developments, or general web information. Parameters: query (required), max_results (optional, default 5), include_images (optional, default False)."
-        ),
-        StructuredTool.from_function(
-            wikipedia_wrapper,
-            name="wikipedia_search_tool",
-            description="Searches Wikipedia for encyclopedic summaries and overviews. Use this for getting general knowledge, definitions, or background information on topics. Parameters: query (required), sentences (optional, default 5)."
-        )
-    ]
+    # Semantic cache lookup (skips the agent run entirely on a hit)
+    cache = get_semantic_cache(model) if use_cache else None
+    if cache is not None:
+        try:
+            cached = cache.lookup(task)
+        except Exception:
+            cached = None  # A broken cache (e.g. encoder failed to load) is just a miss
+        if cached is not None:
+            if return_messages:
+                return (cached, [{"role": "user", "content": task}])
+            return cached
     
     # System prompt with tool descriptions
-    system_prompt = f"""You are a research assistant with access to three tools:
-
-1. arxiv_search_tool: Searches arXiv for academic research papers. Use this for finding scientific papers, academic articles, or research publications. IMPORTANT: Only pass the 'query' parameter. Do NOT specify max_results - it defaults to 5 and that is the maximum allowed.
-
-2. tavily_search_tool: Performs a general-purpose web search using Tavily. Use this for finding current news, recent developments, or general web information.
-
-3. wikipedia_search_tool: Searches Wikipedia for encyclopedic summaries and overviews. Use this for getting general knowledge, definitions, or background information on topics.
-
-Today is {datetime.now().strftime('%Y-%m-%d')}.
+    system_prompt = _system_prompt()
 
-Use the appropriate tools to gather information and provide a comprehensive answer to the user's task."""
+    # Prefetch tool observations concurrently for broad tasks
+    user_content = task
+    observations = []
+    if prefetch:
+        observations = _run_coroutine(_prefetch_sources(task))
+        user_content = f"{task}\n\nPre-fetched tool results:\n\n" + "\n\n".join(
+            f"[{name}]\n{text}" for name, text in observations
+        )
 
     try:
-        # Create agent using LangChain 1.2.9's create_agent
-        agent = agents.create_agent(
-            model=llm,
-            tools=tools,
-            system_prompt=system_prompt
-        )
+        # Create agent using LangChain 1.2.9's create_agent (reused across calls)
+        agent = _get_agent(model, system_prompt)
         
-        # Invoke the agent with the task and recursion limit
-        result = agent.invoke(
-            {"messages": [{"role": "user", "content": task}]},
-            config={"recursion_limit": 5}  # Limits agent iterations to 5
-        )
+        # Run the agent step by step; stop early once the tool observations hold
+        # enough references instead of spending the remaining round-trips
+        messages = []
+        stopped_early = False
+        for state in agent.stream(
+            {"messages": [{"role": "user", "content": user_content}]},
+            config={"recursion_limit": 5},  # Fallback: limits agent iterations to 5
+            stream_mode="values"
+        ):
+            if on_message is not None:
+                for msg in state["messages"][len(messages):]:
+                    on_message(msg)
+            messages = state["messages"]
+            if early_exit and _has_enough_evidence(messages):
+                stopped_early = True
+                break
         
-        # Extract the response - result format may vary, try common patterns
-        if isinstance(result, dict):
-            if "messages" in result:
-                # Get the last message
-                messages = result["messages"]
-                if messages:
-                    last_msg = messages[-1]
-                    if hasattr(last_msg, "content"):
-                        result_text = last_msg.content
-                    elif isinstance(last_msg, dict) and "content" in last_msg:
-                        result_text = last_msg["content"]
-                    else:
-                        result_text = str(last_msg)
-                else:
-                    result_text = str(result)
-            elif "output" in result:
-                result_text = result["output"]
-            else:
-                result_text = str(result)
+        if stopped_early:
+            result_text = _answer_from_evidence(get_llm(model), system_prompt, messages)
         else:
-            result_text = str(result)
+            result_text = messages[-1].content
+        
+        if cache is not None and not _had_tool_error(messages, observations):
+            try:
+                cache.add(task, result_text)
+            except Exception:
+                pass  # Never lose a finished answer to a cache write failure
         
         # Handle return_messages flag (for compatibility)
         if return_messages:
@@ -102,4 +247,43 @@ Use the appropriate tools to gather information and provide a comprehensive answ
         return result_text
         
     except Exception as e:
-        return f"[Model Error: {e}]"
\ No newline at end of file
+        return f"[Model Error: {e}]"
+
+
+# =========================
+# Async / Batch
+# =========================
+async def find_references_async(task: str, **kwargs):
+    """Async wrapper around find_references (runs the blocking agent in a worker thread)."""
+    return await asyncio.to_thread(find_references, task, **kwargs)
+
+
+def find_references_batch(tasks: list[str], max_concurrency: int | None = None, **kwargs) -> list:
+    """
+    Run several research tasks concurrently.
+    
+    Args:
+        tasks: Research tasks to run.
+        max_concurrency: Maximum tasks in flight, at least 1 (default: OLLAMA_NUM_PARALLEL, or 2).
+        **kwargs: Passed through to find_references.
+    
+    Returns:
+        Results in the same order as tasks.
+    """
+    if max_concurrency is None:
+        try:
+            max_concurrency = int(os.getenv("OLLAMA_NUM_PARALLEL", "2"))
+        except ValueError:
+            max_concurrency = 2
+    max_concurrency = max(1, max_concurrency)  # Semaphore(0) would never let a task run
+    
+    async def run_all():
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run(task):
+            async with semaphore:
+                return await find_references_async(task, **kwargs)
+        
+        return await asyncio.gather(*(run(task) for task in tasks))
+    
+    return _run_coroutine(run_all())
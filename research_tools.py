@@ -1,9 +1,13 @@
 # --- Standard library ---
+import functools
 import os
 import xml.etree.ElementTree as ET
+from dataclasses import asdict, dataclass
 
 # --- Third-party ---
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 from tavily import TavilyClient
 import wikipedia
@@ -11,15 +15,59 @@ import wikipedia
 # Init env
 load_dotenv()  # load variables 
 
-# Set user-agent for requests to arXiv
+class ToolError(Exception):
+    """Raised by the search tools when no results can be returned (network, API or parsing failure)."""
+
+
+# Result records (slotted: smaller than dicts, with fast attribute access)
+@dataclass(slots=True)
+class PaperResult:
+    title: str
+    authors: tuple[str, ...]
+    published: str
+    url: str
+    summary: str
+    link_pdf: str | None = None
+
+
+@dataclass(slots=True)
+class WebResult:
+    title: str
+    content: str
+    url: str
+
+
+@dataclass(slots=True)
+class ImageResult:
+    image_url: str
+
+
+@dataclass(slots=True)
+class WikiResult:
+    title: str
+    summary: str
+    url: str
+
+
+# Shared session for arXiv: keeps connections alive across calls (no new TLS
+# handshake per search), sets the user-agent, and retries the 429/503 responses
+# arXiv sends under load (honouring Retry-After) instead of failing the search
 session = requests.Session()
 session.headers.update({
     "User-Agent": "LF-ADP-Agent/1.0 (mailto:your.email@example.com)"
 })
+session.mount("https://", HTTPAdapter(max_retries=Retry(
+    total=3,
+    backoff_factor=1,
+    status_forcelist=(429, 500, 502, 503, 504),
+)))
 
-def arxiv_search_tool(query: str, max_results: int = 5) -> list[dict]:
+def arxiv_search_tool(query: str, max_results: int = 5, summary_chars: int | None = None) -> list[PaperResult]:
     """
     Searches arXiv for research papers matching the given query.
+    If summary_chars is set, summaries are truncated to that many characters
+    (callers that only display a preview avoid carrying full abstracts around).
+    Raises ToolError if the request or the response parsing fails.
     """
     url = f"https://export.arxiv.org/api/query?search_query=all:{query}&start=0&max_results={max_results}"
 
@@ -27,7 +75,7 @@ def arxiv_search_tool(query: str, max_results: int = 5) -> list[dict]:
         response = session.get(url, timeout=60)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
-        return [{"error": str(e)}]
+        raise ToolError(str(e)) from e
 
     try:
         root = ET.fromstring(response.content)
@@ -36,10 +84,12 @@ def arxiv_search_tool(query: str, max_results: int = 5) -> list[dict]:
         results = []
         for entry in root.findall('atom:entry', ns):
             title = entry.find('atom:title', ns).text.strip()
-            authors = [author.find('atom:name', ns).text for author in entry.findall('atom:author', ns)]
+            authors = tuple(author.find('atom:name', ns).text for author in entry.findall('atom:author', ns))
             published = entry.find('atom:published', ns).text[:10]
             url_abstract = entry.find('atom:id', ns).text
             summary = entry.find('atom:summary', ns).text.strip()
+            if summary_chars is not None and len(summary) > summary_chars:
+                summary = summary[:summary_chars]
 
             link_pdf = None
             for link in entry.findall('atom:link', ns):
@@ -47,18 +97,18 @@ def arxiv_search_tool(query: str, max_results: int = 5) -> list[dict]:
                     link_pdf = link.attrib.get('href')
                     break
 
-            results.append({
-                "title": title,
-                "authors": authors,
-                "published": published,
-                "url": url_abstract,
-                "summary": summary,
-                "link_pdf": link_pdf
-            })
+            results.append(PaperResult(
+                title=title,
+                authors=authors,
+                published=published,
+                url=url_abstract,
+                summary=summary,
+                link_pdf=link_pdf
+            ))
 
         return results
     except Exception as e:
-        return [{"error": f"Parsing failed: {str(e)}"}]
+        raise ToolError(f"Parsing failed: {str(e)}") from e
 
 
 arxiv_tool_def = {
@@ -86,7 +136,14 @@ arxiv_tool_def = {
 
 
 
-def tavily_search_tool(query: str, max_results: int = 5, include_images: bool = False) -> list[dict]:
+@functools.lru_cache(maxsize=4)
+def _get_tavily_client(api_key: str, api_base_url: str | None) -> TavilyClient:
+    """Return a shared TavilyClient per (api_key, base URL) instead of building one per search."""
+    return TavilyClient(api_key=api_key, api_base_url=api_base_url)
+
+
+def tavily_search_tool(query: str, max_results: int = 5, include_images: bool = False,
+                       content_chars: int | None = None) -> list[WebResult | ImageResult]:
     """
     Perform a search using the Tavily API.
 
@@ -94,23 +151,19 @@ def tavily_search_tool(query: str, max_results: int = 5, include_images: bool =
         query (str): The search query.
         max_results (int): Number of results to return (default 5).
         include_images (bool): Whether to include image results.
+        content_chars (int | None): If set, truncate each result's content to this many characters.
 
     Returns:
-        list[dict]: A list of dictionaries with keys like 'title', 'content', and 'url'.
+        list[WebResult | ImageResult]: Web results (title, content, url), followed by
+            ImageResult records if include_images is set.
+
+    Raises:
+        ToolError: If the API key is missing or the search fails.
     """
-    params = {}
     api_key = os.getenv("TAVILY_API_KEY")
     if not api_key:
-        raise ValueError("TAVILY_API_KEY not found in environment variables.")
-    params['api_key'] = api_key
-
-    #client = TavilyClient(api_key)
-
-    api_base_url = os.getenv("DLAI_TAVILY_BASE_URL")
-    if api_base_url:
-        params['api_base_url'] = api_base_url
-
-    client = TavilyClient(api_key=api_key, api_base_url=api_base_url)
+        raise ToolError("TAVILY_API_KEY not found in environment variables.")
+    client = _get_tavily_client(api_key, os.getenv("DLAI_TAVILY_BASE_URL"))
 
     try:
         response = client.search(
@@ -121,20 +174,23 @@ def tavily_search_tool(query: str, max_results: int = 5, include_images: bool =
 
         results = []
         for r in response.get("results", []):
-            results.append({
-                "title": r.get("title", ""),
-                "content": r.get("content", ""),
-                "url": r.get("url", "")
-            })
+            content = r.get("content", "")
+            if content_chars is not None and len(content) > content_chars:
+                content = content[:content_chars]
+            results.append(WebResult(
+                title=r.get("title", ""),
+                content=content,
+                url=r.get("url", "")
+            ))
 
         if include_images:
             for img_url in response.get("images", []):
-                results.append({"image_url": img_url})
+                results.append(ImageResult(image_url=img_url))
 
         return results
 
     except Exception as e:
-        return [{"error": str(e)}]  # For LLM-friendly agents
+        raise ToolError(str(e)) from e
     
 
 tavily_tool_def = {
@@ -167,7 +223,7 @@ tavily_tool_def = {
 
 ## Wikipedia search tool
 
-def wikipedia_search_tool(query: str, sentences: int = 5) -> list[dict]:
+def wikipedia_search_tool(query: str, sentences: int = 5) -> list[WikiResult]:
     """
     Searches Wikipedia for a summary of the given query.
 
@@ -176,20 +232,23 @@ def wikipedia_search_tool(query: str, sentences: int = 5) -> list[dict]:
         sentences (int): Number of sentences to include in the summary.
 
     Returns:
-        list[dict]: A list with a single dictionary containing title, summary, and URL.
+        list[WikiResult]: A list with a single record containing title, summary, and URL.
+
+    Raises:
+        ToolError: If no article is found or the lookup fails.
     """
     try:
         page_title = wikipedia.search(query)[0]
         page = wikipedia.page(page_title)
         summary = wikipedia.summary(page_title, sentences=sentences)
 
-        return [{
-            "title": page.title,
-            "summary": summary,
-            "url": page.url
-        }]
+        return [WikiResult(
+            title=page.title,
+            summary=summary,
+            url=page.url
+        )]
     except Exception as e:
-        return [{"error": str(e)}]
+        raise ToolError(str(e)) from e
 
 # Tool definition
 wikipedia_tool_def = {
@@ -217,9 +276,24 @@ wikipedia_tool_def = {
 
 
 
-# Tool mapping
+def _as_function_result(fn):
+    """
+    Adapt a search tool to OpenAI-style function calling, which expects
+    JSON-serializable results: records become dicts, and a ToolError becomes
+    [{"error": ...}] so the model sees the failure instead of the caller crashing.
+    """
+    @functools.wraps(fn)
+    def call(*args, **kwargs) -> list[dict]:
+        try:
+            return [asdict(r) for r in fn(*args, **kwargs)]
+        except ToolError as e:
+            return [{"error": str(e)}]
+    return call
+
+
+# Tool mapping (for function calling with the *_tool_def schemas above)
 tool_mapping = {
-    "tavily_search_tool": tavily_search_tool,
-    "arxiv_search_tool": arxiv_search_tool,
-    "wikipedia_search_tool": wikipedia_search_tool
+    "tavily_search_tool": _as_function_result(tavily_search_tool),
+    "arxiv_search_tool": _as_function_result(arxiv_search_tool),
+    "wikipedia_search_tool": _as_function_result(wikipedia_search_tool)
 }
\ No newline at end of file
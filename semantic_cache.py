@@ -0,0 +1,304 @@
+# =========================
+# Semantic Cache
+# =========================
+"""
+Embedding-based cache for research results. Semantically equivalent tasks
+(e.g. "recent black hole developments" vs "latest black hole research") are
+answered from the cache instead of re-running the agent.
+
+QueryCache applies the same idea to individual tool queries, in memory
+(embedding matches there are opt-in).
+
+Requires the optional `sentence-transformers` and `faiss-cpu` packages; if
+they are not installed the embedding lookups silently disable themselves.
+"""
+
+# --- Standard library ---
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+DEFAULT_THRESHOLD = 0.92
+DEFAULT_TTL = 24 * 3600  # Seconds a cached result stays valid (same as the Tavily tool cache)
+
+log = logging.getLogger(__name__)
+
+_encoder = None
+_encoder_failed = False  # set once loading fails, so later calls don't retry
+_encoder_lock = threading.Lock()
+
+
+def get_encoder(model_name: str = DEFAULT_EMBEDDING_MODEL):
+    """
+    Load the sentence-transformer used for embeddings (once per process).
+
+    Returns:
+        The SentenceTransformer instance, or None if it is not installed or
+        failed to load (e.g. offline with the model not downloaded).
+    """
+    global _encoder, _encoder_failed
+    with _encoder_lock:
+        if _encoder is None and not _encoder_failed:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                _encoder_failed = True
+                return None
+            try:
+                _encoder = SentenceTransformer(model_name)
+            except Exception as e:
+                log.warning("embedding model %s failed to load, semantic caching disabled: %s", model_name, e)
+                _encoder_failed = True
+        return _encoder
+
+
+def preload_encoder(model_name: str = DEFAULT_EMBEDDING_MODEL) -> None:
+    """Start loading the encoder in a background thread, so no caller waits for the model load."""
+    threading.Thread(target=get_encoder, args=(model_name,), daemon=True).start()
+
+
+def embed(texts: list[str]):
+    """
+    Embed texts as L2-normalized float32 vectors (so inner product == cosine).
+
+    Returns:
+        A (len(texts), dim) numpy array, or None if no encoder is available.
+    """
+    encoder = get_encoder()
+    if encoder is None:
+        return None
+    return encoder.encode(texts, normalize_embeddings=True, convert_to_numpy=True).astype("float32")
+
+
+class SemanticCache:
+    """
+    Nearest-neighbour cache over task embeddings, backed by a FAISS inner-product
+    index and persisted to disk so later runs start warm. Entries expire after
+    `ttl` seconds; expired entries are dropped when the cache is loaded.
+    """
+
+    def __init__(self, path: Optional[str] = None, threshold: float = DEFAULT_THRESHOLD,
+                 ttl: float = DEFAULT_TTL):
+        """
+        Args:
+            path: Directory used to persist the index and entries (None = memory only).
+            threshold: Minimum cosine similarity for a cache hit.
+            ttl: Seconds an entry stays valid.
+        """
+        self.path = path
+        self.threshold = threshold
+        self.ttl = ttl
+        self.entries: list[tuple[str, str, float]] = []  # (task, result_text, ts), parallel to the index
+        self.index = None
+        self._lock = threading.Lock()
+        self._faiss = None
+        try:
+            import faiss
+            self._faiss = faiss
+        except ImportError:
+            return
+        self._load()
+
+    @property
+    def enabled(self) -> bool:
+        return self._faiss is not None and get_encoder() is not None
+
+    def _files(self) -> tuple[str, str]:
+        return os.path.join(self.path, "index.faiss"), os.path.join(self.path, "entries.json")
+
+    def _load(self) -> None:
+        if not self.path:
+            return
+        index_file, entries_file = self._files()
+        if not (os.path.exists(index_file) and os.path.exists(entries_file)):
+            return
+        try:
+            with open(entries_file, encoding="utf-8") as f:
+                # Entries written before timestamps were stored count as expired
+                entries = [(e[0], e[1], e[2] if len(e) > 2 else 0.0) for e in json.load(f)]
+            index = self._faiss.read_index(index_file)
+        except Exception:
+            return  # Corrupt cache files: start cold
+        if index.ntotal != len(entries):
+            return
+        
+        # Drop expired entries (a flat index cannot remove rows, so rebuild it)
+        since = time.time() - self.ttl
+        keep = [i for i, entry in enumerate(entries) if entry[2] > since]
+        if len(keep) < len(entries):
+            vecs = index.reconstruct_n(0, index.ntotal)[keep]
+            index = self._faiss.IndexFlatIP(index.d)
+            if keep:
+                index.add(vecs)
+            entries = [entries[i] for i in keep]
+        self.index, self.entries = index, entries
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        index_file, entries_file = self._files()
+        self._faiss.write_index(self.index, index_file)
+        with open(entries_file, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+
+    def lookup(self, task: str) -> Optional[str]:
+        """
+        Return the cached result for the most similar unexpired task, if similar enough.
+        """
+        if not self.enabled:
+            return None
+        vec = embed([task])
+        if vec is None:
+            return None
+        since = time.time() - self.ttl
+        with self._lock:
+            if self.index is None or self.index.ntotal == 0:
+                return None
+            scores, ids = self.index.search(vec, min(5, self.index.ntotal))
+            for score, i in zip(scores[0], ids[0]):
+                if i < 0 or score < self.threshold:
+                    break
+                if self.entries[i][2] > since:
+                    return self.entries[i][1]
+        return None
+
+    def add(self, task: str, result_text: str) -> None:
+        """
+        Store a task/result pair and persist the cache.
+        """
+        if not self.enabled:
+            return
+        vec = embed([task])
+        if vec is None:
+            return
+        with self._lock:
+            if self.index is None:
+                self.index = self._faiss.IndexFlatIP(vec.shape[1])
+            self.index.add(vec)
+            self.entries.append((task, result_text, time.time()))
+            self._save()
+
+
+_STOP_WORDS = frozenset({
+    "a", "about", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how",
+    "in", "is", "it", "of", "on", "or", "the", "to", "what", "when", "where",
+    "which", "who", "why", "with",
+})
+
+
+def normalize_query(query: str) -> str:
+    """
+    Casefold, drop stop words and sort the remaining whitespace-separated tokens
+    ("The top movies" -> "movies top"). Punctuation is kept, so "C++" and "C#" stay distinct.
+    """
+    return " ".join(sorted({t for t in query.casefold().split() if t not in _STOP_WORDS}))
+
+
+class QueryCache:
+    """
+    In-memory near-duplicate cache for tool queries. A lookup first tries the
+    normalized query (exact); with embeddings enabled, lookup_similar then
+    compares the query embedding against all stored entries in a single
+    matrix-vector product. Entries only match within the same scope (tool +
+    call parameters).
+    """
+
+    def __init__(self, max_entries: int = 512, threshold: float = DEFAULT_THRESHOLD, embeddings: bool = False):
+        """
+        Args:
+            max_entries: Maximum entries kept per tier (oldest evicted first).
+            threshold: Minimum cosine similarity for an embedding match.
+            embeddings: Enable the embedding tier. The encoder is loaded in the
+                background; until it is ready, queries are neither embedded nor
+                matched by similarity.
+        """
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.embeddings = embeddings
+        self._by_norm: "OrderedDict[tuple, tuple[float, Any]]" = OrderedDict()  # (scope, normalized) -> (ts, value)
+        self._scopes: list[tuple] = []
+        self._entries: list[tuple[float, Any]] = []  # (ts, value), parallel to the rows of _matrix
+        self._matrix = None
+        self._lock = threading.Lock()
+        if embeddings:
+            preload_encoder()
+
+    def embed(self, query: str):
+        """
+        Embed a query for lookup_similar and add.
+
+        Returns:
+            A (1, dim) array, or None if embeddings are disabled or the encoder is not loaded yet.
+        """
+        if not self.embeddings or _encoder is None:  # never wait for the model load
+            return None
+        return embed([query])
+
+    def lookup(self, query: str, scope: tuple, since: float = 0.0) -> Optional[Any]:
+        """
+        Return a cached value for the same normalized query in the same scope, stored after `since`.
+        """
+        norm_key = (scope, normalize_query(query))
+        with self._lock:
+            entry = self._by_norm.get(norm_key)
+            if entry is not None and entry[0] > since:
+                return entry[1]
+        return None
+
+    def lookup_similar(self, vec, scope: tuple, since: float = 0.0) -> Optional[Any]:
+        """
+        Return the cached value whose query embedding is most similar to `vec` (from embed),
+        in the same scope and stored after `since`.
+        """
+        if vec is None:
+            return None
+        with self._lock:
+            if self._matrix is None:
+                return None
+            sims = self._matrix @ vec[0]
+            best, best_sim = None, self.threshold
+            for i in sims.argsort()[::-1]:
+                if sims[i] < best_sim:
+                    break
+                if self._scopes[i] == scope and self._entries[i][0] > since:
+                    best = self._entries[i][1]
+                    break
+            return best
+
+    def add(self, query: str, scope: tuple, value: Any, vec=None) -> None:
+        """
+        Store a value under the query's normalized form and, if given, its embedding
+        (from embed; pass the one computed for the lookup instead of embedding again).
+        """
+        ts = time.time()
+        with self._lock:
+            norm_key = (scope, normalize_query(query))
+            self._by_norm[norm_key] = (ts, value)
+            self._by_norm.move_to_end(norm_key)
+            if len(self._by_norm) > self.max_entries:
+                self._by_norm.popitem(last=False)
+
+        if vec is None:
+            return
+        import numpy as np
+        with self._lock:
+            self._matrix = vec if self._matrix is None else np.vstack([self._matrix, vec])
+            self._scopes.append(scope)
+            self._entries.append((ts, value))
+            if len(self._entries) > self.max_entries:  # evict the oldest
+                self._matrix = self._matrix[1:]
+                del self._scopes[0]
+                del self._entries[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_norm.clear()
+            self._scopes.clear()
+            self._entries.clear()
+            self._matrix = None
@@ -5,7 +5,8 @@ Calls the real arXiv API and prints results to console.
 """
 
 import json
-from research_tools import arxiv_search_tool
+from dataclasses import asdict
+from research_tools import ToolError, arxiv_search_tool
 
 
 def print_results(results, query, max_results):
@@ -23,20 +24,15 @@ def print_results(results, query, max_results):
         print("No results returned.")
         return
     
-    # Check for errors
-    if "error" in results[0]:
-        print(f"ERROR: {results[0]['error']}")
-        return
-    
     # Print each result
     for i, result in enumerate(results, 1):
         print(f"\n--- Result {i} ---")
-        print(f"Title: {result.get('title', 'N/A')}")
-        print(f"Authors: {', '.join(result.get('authors', []))}")
-        print(f"Published: {result.get('published', 'N/A')}")
-        print(f"URL: {result.get('url', 'N/A')}")
-        print(f"PDF Link: {result.get('link_pdf', 'N/A')}")
-        summary = result.get('summary', 'N/A')
+        print(f"Title: {result.title}")
+        print(f"Authors: {', '.join(result.authors)}")
+        print(f"Published: {result.published}")
+        print(f"URL: {result.url}")
+        print(f"PDF Link: {result.link_pdf}")
+        summary = result.summary
         # Truncate long summaries
         if len(summary) > 300:
             summary = summary[:300] + "..."
@@ -46,10 +42,25 @@ def print_results(results, query, max_results):
     print("\n" + "=" * 80)
     print("Raw JSON Output:")
     print("=" * 80)
-    print(json.dumps(results, indent=2, ensure_ascii=False))
+    print(json.dumps([asdict(r) for r in results], indent=2, ensure_ascii=False))
     print("=" * 80)
 
 
+def run_case(header, query, max_results=None):
+    """Run one search and print its results; an error only fails this case."""
+    print(header)
+    print("-" * 80)
+    try:
+        if max_results is None:
+            results = arxiv_search_tool(query)
+        else:
+            results = arxiv_search_tool(query, max_results=max_results)
+    except ToolError as e:
+        print(f"\nERROR: {e}")
+        return
+    print_results(results, query, 5 if max_results is None else max_results)
+
+
 def main():
     """Main test function."""
     print("\n" + "=" * 80)
@@ -57,22 +68,13 @@ def main():
     print("=" * 80 + "\n")
     
     # Test 1: Basic search with default max_results
-    print("\n[Test 1] Basic search: 'machine learning' (default max_results=5)")
-    print("-" * 80)
-    results1 = arxiv_search_tool("machine learning")
-    print_results(results1, "machine learning", 5)
+    run_case("\n[Test 1] Basic search: 'machine learning' (default max_results=5)", "machine learning")
     
     # Test 2: Search with custom max_results
-    print("\n\n[Test 2] Search with max_results=3: 'quantum computing'")
-    print("-" * 80)
-    results2 = arxiv_search_tool("quantum computing", max_results=3)
-    print_results(results2, "quantum computing", 3)
+    run_case("\n\n[Test 2] Search with max_results=3: 'quantum computing'", "quantum computing", max_results=3)
     
     # Test 3: Another query
-    print("\n\n[Test 3] Search: 'neural networks' (max_results=2)")
-    print("-" * 80)
-    results3 = arxiv_search_tool("neural networks", max_results=2)
-    print_results(results3, "neural networks", 2)
+    run_case("\n\n[Test 3] Search: 'neural networks' (max_results=2)", "neural networks", max_results=2)
     
     print("\n" + "=" * 80)
     print("All tests completed!")
@@ -5,8 +5,9 @@ Calls the real Tavily API and prints results to console.
 """
 
 import json
+from dataclasses import asdict
 import os
-from research_tools import tavily_search_tool
+from research_tools import ImageResult, ToolError, tavily_search_tool
 
 
 def print_results(results, query, max_results, include_images):
@@ -25,21 +26,16 @@ def print_results(results, query, max_results, include_images):
         print("No results returned.")
         return
     
-    # Check for errors
-    if "error" in results[0]:
-        print(f"ERROR: {results[0]['error']}")
-        return
-    
     # Separate regular results from image results
-    regular_results = [r for r in results if "image_url" not in r]
-    image_results = [r for r in results if "image_url" in r]
+    regular_results = [r for r in results if not isinstance(r, ImageResult)]
+    image_results = [r for r in results if isinstance(r, ImageResult)]
     
     # Print regular results
     for i, result in enumerate(regular_results, 1):
         print(f"\n--- Result {i} ---")
-        print(f"Title: {result.get('title', 'N/A')}")
-        print(f"URL: {result.get('url', 'N/A')}")
-        content = result.get('content', 'N/A')
+        print(f"Title: {result.title}")
+        print(f"URL: {result.url}")
+        content = result.content
         # Truncate long content
         if len(content) > 500:
             content = content[:500] + "..."
@@ -50,13 +46,13 @@ def print_results(results, query, max_results, include_images):
     if image_results:
         print(f"\n--- Image Results ({len(image_results)} images) ---")
         for i, img_result in enumerate(image_results, 1):
-            print(f"Image {i}: {img_result.get('image_url', 'N/A')}")
+            print(f"Image {i}: {img_result.image_url}")
         print("-" * 80)
     
     print("\n" + "=" * 80)
     print("Raw JSON Output:")
     print("=" * 80)
-    print(json.dumps(results, indent=2, ensure_ascii=False))
+    print(json.dumps([asdict(r) for r in results], indent=2, ensure_ascii=False))
     print("=" * 80)
 
 
@@ -70,7 +66,7 @@ def main():
     api_key = os.getenv("TAVILY_API_KEY")
     if not api_key:
         print("WARNING: TAVILY_API_KEY not found in environment variables.")
-        print("The tool will raise a ValueError if called without an API key.")
+        print("The tool will raise a ToolError if called without an API key.")
         print("=" * 80 + "\n")
     
     try:
@@ -92,9 +88,10 @@ def main():
         results3 = tavily_search_tool("Python programming", max_results=2, include_images=False)
         print_results(results3, "Python programming", 2, False)
         
-    except ValueError as e:
+    except ToolError as e:
         print(f"\nERROR: {e}")
-        print("Please set TAVILY_API_KEY in your .env file or environment variables.")
+        if not api_key:
+            print("Please set TAVILY_API_KEY in your .env file or environment variables.")
     except Exception as e:
         print(f"\nERROR: {e}")
     
@@ -5,7 +5,8 @@ Calls the real Wikipedia API and prints results to console.
 """
 
 import json
-from research_tools import wikipedia_search_tool
+from dataclasses import asdict
+from research_tools import ToolError, wikipedia_search_tool
 
 
 def print_results(results, query, sentences):
@@ -23,17 +24,12 @@ def print_results(results, query, sentences):
         print("No results returned.")
         return
     
-    # Check for errors
-    if "error" in results[0]:
-        print(f"ERROR: {results[0]['error']}")
-        return
-    
     # Print result (Wikipedia typically returns one result)
     for i, result in enumerate(results, 1):
         print(f"\n--- Result {i} ---")
-        print(f"Title: {result.get('title', 'N/A')}")
-        print(f"URL: {result.get('url', 'N/A')}")
-        summary = result.get('summary', 'N/A')
+        print(f"Title: {result.title}")
+        print(f"URL: {result.url}")
+        summary = result.summary
         # Count actual sentences in summary
         sentence_count = summary.count('.') + summary.count('!') + summary.count('?')
         print(f"Summary (approx. {sentence_count} sentences):")
@@ -44,10 +40,25 @@ def print_results(results, query, sentences):
     print("\n" + "=" * 80)
     print("Raw JSON Output:")
     print("=" * 80)
-    print(json.dumps(results, indent=2, ensure_ascii=False))
+    print(json.dumps([asdict(r) for r in results], indent=2, ensure_ascii=False))
     print("=" * 80)
 
 
+def run_case(header, query, sentences=None):
+    """Run one search and print its results; an error only fails this case."""
+    print(header)
+    print("-" * 80)
+    try:
+        if sentences is None:
+            results = wikipedia_search_tool(query)
+        else:
+            results = wikipedia_search_tool(query, sentences=sentences)
+    except ToolError as e:
+        print(f"\nERROR: {e}")
+        return
+    print_results(results, query, 5 if sentences is None else sentences)
+
+
 def main():
     """Main test function."""
     print("\n" + "=" * 80)
@@ -55,28 +66,16 @@ def main():
     print("=" * 80 + "\n")
     
     # Test 1: Basic search with default sentences
-    print("\n[Test 1] Basic search: 'artificial intelligence' (default sentences=5)")
-    print("-" * 80)
-    results1 = wikipedia_search_tool("artificial intelligence")
-    print_results(results1, "artificial intelligence", 5)
+    run_case("\n[Test 1] Basic search: 'artificial intelligence' (default sentences=5)", "artificial intelligence")
     
     # Test 2: Search with custom sentences
-    print("\n\n[Test 2] Search with sentences=3: 'machine learning'")
-    print("-" * 80)
-    results2 = wikipedia_search_tool("machine learning", sentences=3)
-    print_results(results2, "machine learning", 3)
+    run_case("\n\n[Test 2] Search with sentences=3: 'machine learning'", "machine learning", sentences=3)
     
     # Test 3: Another query with more sentences
-    print("\n\n[Test 3] Search: 'quantum computing' (sentences=10)")
-    print("-" * 80)
-    results3 = wikipedia_search_tool("quantum computing", sentences=10)
-    print_results(results3, "quantum computing", 10)
+    run_case("\n\n[Test 3] Search: 'quantum computing' (sentences=10)", "quantum computing", sentences=10)
     
     # Test 4: Test with a different topic
-    print("\n\n[Test 4] Search: 'Python programming language' (sentences=7)")
-    print("-" * 80)
-    results4 = wikipedia_search_tool("Python programming language", sentences=7)
-    print_results(results4, "Python programming language", 7)
+    run_case("\n\n[Test 4] Search: 'Python programming language' (sentences=7)", "Python programming language", sentences=7)
     
     print("\n" + "=" * 80)
     print("All tests completed!")
@@ -135,6 +135,44 @@ def extract_urls(text: str) -> list[dict[str, Any]]:
         items.append({"title": None, "url": u, "source": host or None})
     return items
 
+_TRIE_END = "$"  # never a valid DNS label
+
+
+class DomainTrie:
+    """
+    Reversed-label trie over trusted domains, for large allow-lists.
+    Matching a host costs O(number of labels) regardless of list size, and
+    only whole labels match: 'foo.mit.edu' matches 'mit.edu', 'summit.edu' does not.
+    Can be passed wherever a TOP_DOMAINS set is accepted.
+    """
+
+    def __init__(self, domains):
+        self.domains = set(domains)
+        self.root: dict = {}
+        for domain in self.domains:
+            node = self.root
+            for label in reversed(domain.lower().strip(".").split(".")):
+                node = node.setdefault(label, {})
+            node[_TRIE_END] = True
+
+    def __iter__(self):
+        return iter(self.domains)
+
+    def __len__(self):
+        return len(self.domains)
+
+    def matches(self, host: str) -> bool:
+        """True if host is a trusted domain or a subdomain of one."""
+        node = self.root
+        for label in reversed(host.lower().partition(":")[0].split(".")):
+            node = node.get(label)
+            if node is None:
+                return False
+            if _TRIE_END in node:
+                return True
+        return False
+
+
 def evaluate_anytext_against_domains(TOP_DOMAINS: set[str], payload: Any, min_ratio: float = 0.4):
     """
     Accepts:
@@ -175,7 +213,12 @@ def evaluate_anytext_against_domains(TOP_DOMAINS: set[str], payload: Any, min_ra
     for it in items:
         url = (it or {}).get("url")
         host = _extract_hostname(url or "")
-        ok = any(host.endswith(dom) for dom in TOP_DOMAINS) if host else False
+        if not host:
+            ok = False
+        elif isinstance(TOP_DOMAINS, DomainTrie):
+            ok = TOP_DOMAINS.matches(host)
+        else:
+            ok = any(host.endswith(dom) for dom in TOP_DOMAINS)
         if ok:
             approved += 1
         details.append({
@@ -232,7 +275,8 @@ def evaluate_tavily_results(TOP_DOMAINS, raw, min_ratio=0.4):
     Evaluate whether Tavily search results mostly come from trusted domains.
 
     Args:
-        TOP_DOMAINS (set[str]): Set of trusted domains (e.g., 'arxiv.org', 'nature.com').
+        TOP_DOMAINS (set[str] | DomainTrie): Set of trusted domains (e.g., 'arxiv.org', 'nature.com'),
+            or a DomainTrie built from one for large lists.
         raw (str | list[dict]): Tavily output (can be a JSON string or list of dicts with 'url').
         min_ratio (float): Minimum trusted ratio required to pass (e.g., 0.4 = 40%).
 
@@ -263,7 +307,10 @@ def evaluate_tavily_results(TOP_DOMAINS, raw, min_ratio=0.4):
     for r in results:
         url = r.get("url", "")
         domain = url.split("/")[2] if "://" in url else url
-        trusted = any(td in domain for td in TOP_DOMAINS)
+        if isinstance(TOP_DOMAINS, DomainTrie):
+            trusted = TOP_DOMAINS.matches(domain)
+        else:
+            trusted = any(td in domain for td in TOP_DOMAINS)
         if trusted:
             trusted_count += 1
         details.append(f"- {url} → {'✅ TRUSTED' if trusted else '❌ NOT TRUSTED'}")
@@ -291,7 +338,8 @@ def evaluate_tavily_results(TOP_DOMAINS, raw: str, min_ratio=0.4):
     Evaluate whether plain-text research results mostly come from trusted domains.
 
     Args:
-        TOP_DOMAINS (set[str]): Set of trusted domains (e.g., 'arxiv.org', 'nature.com').
+        TOP_DOMAINS (set[str] | DomainTrie): Set of trusted domains (e.g., 'arxiv.org', 'nature.com'),
+            or a DomainTrie built from one for large lists.
         raw (str): Plain text or Markdown containing URLs.
         min_ratio (float): Minimum trusted ratio required to pass (e.g., 0.4 = 40%).
 
@@ -319,7 +367,10 @@ Please include links in your research results.
 
     for url in urls:
         domain = url.split("/")[2]
-        trusted = any(td in domain for td in TOP_DOMAINS)
+        if isinstance(TOP_DOMAINS, DomainTrie):
+            trusted = TOP_DOMAINS.matches(domain)
+        else:
+            trusted = any(td in domain for td in TOP_DOMAINS)
         if trusted:
             trusted_count += 1
         details.append(f"- {url} → {'✅ TRUSTED' if trusted else '❌ NOT TRUSTED'}")